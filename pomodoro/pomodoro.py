@@ -2,8 +2,9 @@
 """Pomodoro Timer CLI - work/break sessions with sound notifications."""
 
 import argparse
+import io
+import os
 import shutil
-import subprocess
 import sys
 import time
 
@@ -31,6 +32,19 @@ class Timer:
 
 # ── Sound Notifications ──────────────────────────────────────────────
 
+_AFPLAY_PATH = shutil.which("afplay") if sys.platform == "darwin" else None
+_DEVNULL_FD = os.open(os.devnull, os.O_WRONLY) if _AFPLAY_PATH else -1
+
+
+def _reap_children():
+    """Collect exit status of finished afplay processes so they don't linger as zombies."""
+    try:
+        while os.waitpid(-1, os.WNOHANG)[0]:
+            pass
+    except ChildProcessError:
+        pass
+
+
 def notify(sound_type: str):
     """Play a system sound notification (non-blocking, platform-aware)."""
     sounds = {
@@ -42,12 +56,18 @@ def notify(sound_type: str):
     if not path:
         return
 
-    if sys.platform == "darwin" and shutil.which("afplay"):
+    if _AFPLAY_PATH:
+        _reap_children()
         try:
-            subprocess.Popen(
-                ["afplay", path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+            # posix_spawn skips subprocess.Popen's setup; fds 1/2 go to /dev/null
+            os.posix_spawn(
+                _AFPLAY_PATH,
+                [_AFPLAY_PATH, path],
+                os.environ,
+                file_actions=[
+                    (os.POSIX_SPAWN_DUP2, _DEVNULL_FD, 1),
+                    (os.POSIX_SPAWN_DUP2, _DEVNULL_FD, 2),
+                ],
             )
         except OSError:
             pass
@@ -69,6 +89,17 @@ class PomodoroSession:
     SHORT_BREAK = "SHORT BREAK"
     LONG_BREAK = "LONG BREAK"
 
+    __slots__ = (
+        "work_secs",
+        "short_break_secs",
+        "long_break_secs",
+        "total_sessions",
+        "current_session",
+        "phase",
+        "_done",
+        "_durations",
+    )
+
     def __init__(self, work_mins, short_break_mins, long_break_mins, total_sessions):
         self.work_secs = work_mins * 60
         self.short_break_secs = short_break_mins * 60
@@ -77,14 +108,14 @@ class PomodoroSession:
         self.current_session = 1
         self.phase = self.WORK
         self._done = False
+        self._durations = {
+            self.WORK: self.work_secs,
+            self.SHORT_BREAK: self.short_break_secs,
+            self.LONG_BREAK: self.long_break_secs,
+        }
 
     def current_duration(self) -> int:
-        if self.phase == self.WORK:
-            return self.work_secs
-        elif self.phase == self.LONG_BREAK:
-            return self.long_break_secs
-        else:
-            return self.short_break_secs
+        return self._durations[self.phase]
 
     def advance(self):
         """Transition to the next phase. Returns False when all sessions are done."""
@@ -124,8 +155,13 @@ class PomodoroSession:
 class Display:
     """Terminal display with progress bar and session info."""
 
+    __slots__ = ("_last_line_len", "_out")
+
     def __init__(self):
         self._last_line_len = 0
+        # Frames are assembled in our own buffer and flushed once per frame
+        raw = os.fdopen(sys.stdout.fileno(), "wb", buffering=0, closefd=False)
+        self._out = io.BufferedWriter(raw, buffer_size=8192)
 
     def render(self, session: PomodoroSession, remaining: float):
         total = session.current_duration()
@@ -147,20 +183,28 @@ class Display:
             line += " " * (self._last_line_len - len(line))
         self._last_line_len = len(line)
 
-        print(line, end="", flush=True)
+        self._out.write(line.encode("ascii"))
+        self._out.flush()
 
-    def clear_line(self):
+    def _clear_bytes(self) -> bytes:
         term_width = shutil.get_terminal_size((80, 24)).columns
-        print("\r" + " " * term_width + "\r", end="", flush=True)
+        return ("\r" + " " * term_width + "\r").encode("ascii")
+
+    def clear_line(self):
+        self._out.write(self._clear_bytes())
+        self._out.flush()
 
     def phase_complete(self, session: PomodoroSession):
-        self.clear_line()
         if session.is_complete():
-            print(f"All {session.total_sessions} sessions complete!")
+            msg = f"All {session.total_sessions} sessions complete!"
         elif session.phase == session.WORK:
-            print(f"Break over. Starting session {session.current_session}/{session.total_sessions}.")
+            msg = f"Break over. Starting session {session.current_session}/{session.total_sessions}."
         else:
-            print(f"Session {session.current_session}/{session.total_sessions} complete. Take a break!")
+            msg = f"Session {session.current_session}/{session.total_sessions} complete. Take a break!"
+        # Clear and message go out as one frame so ordering is preserved
+        self._out.write(self._clear_bytes())
+        self._out.write(f"{msg}\n".encode("ascii"))
+        self._out.flush()
 
 
 # ── Main ─────────────────────────────────────────────────────────────
@@ -189,15 +233,22 @@ def main():
     start_time = time.monotonic()
 
     print(f"Pomodoro Timer: {args.work}m work / {args.short_break}m break / {args.sessions} sessions")
-    print("Press Ctrl+C to stop.\n")
+    print("Press Ctrl+C to stop.\n", flush=True)
 
     try:
         while not session.is_complete():
             timer = Timer(session.current_duration())
             timer.start()
 
+            # The visible mm:ss only changes once per second, so skip
+            # renders that would redraw the same frame.
+            last_int_rem = -1
             while not timer.is_done():
-                display.render(session, timer.remaining())
+                rem = timer.remaining()
+                int_rem = int(rem)
+                if int_rem != last_int_rem:
+                    display.render(session, rem)
+                    last_int_rem = int_rem
                 time.sleep(0.5)
 
             completed_phase = session.phase
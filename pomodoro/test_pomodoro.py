@@ -1,110 +1,112 @@
-"""Tests for PomodoroSession phase transitions and sound mapping."""
-
-import unittest
-from pomodoro import PomodoroSession
-
-
-class TestPomodoroSessionAdvance(unittest.TestCase):
-    """Test the WORK -> BREAK -> WORK state machine."""
-
-    def test_starts_in_work_phase(self):
-        s = PomodoroSession(25, 5, 15, 4)
-        self.assertEqual(s.phase, s.WORK)
-        self.assertEqual(s.current_session, 1)
-        self.assertFalse(s.is_complete())
-
-    def test_work_to_short_break(self):
-        s = PomodoroSession(25, 5, 15, 4)
-        s.advance()  # session 1 work -> short break
-        self.assertEqual(s.phase, s.SHORT_BREAK)
-
-    def test_short_break_to_work(self):
-        s = PomodoroSession(25, 5, 15, 4)
-        s.advance()  # work -> short break
-        s.advance()  # short break -> work (session 2)
-        self.assertEqual(s.phase, s.WORK)
-        self.assertEqual(s.current_session, 2)
-
-    def test_long_break_after_4th_session(self):
-        s = PomodoroSession(25, 5, 15, 8)
-        # Advance through 4 work+break cycles
-        for _ in range(3):
-            s.advance()  # work -> short break
-            s.advance()  # short break -> work
-        # Now on session 4, advance from work
-        s.advance()
-        self.assertEqual(s.phase, s.LONG_BREAK)
-
-    def test_final_session_sets_done(self):
-        s = PomodoroSession(25, 5, 15, 2)
-        s.advance()  # session 1 work -> short break
-        s.advance()  # short break -> session 2 work
-        result = s.advance()  # session 2 work -> done
-        self.assertFalse(result)
-        self.assertTrue(s.is_complete())
-
-    def test_single_session_completes_immediately(self):
-        s = PomodoroSession(25, 5, 15, 1)
-        result = s.advance()  # only session -> done
-        self.assertFalse(result)
-        self.assertTrue(s.is_complete())
-
-    def test_no_trailing_break(self):
-        """Final work session ends the cycle -- no break after it."""
-        s = PomodoroSession(25, 5, 15, 1)
-        s.advance()
-        self.assertTrue(s.is_complete())
-        # Phase should still be WORK (advance doesn't change it on completion)
-        self.assertEqual(s.phase, s.WORK)
+"""Tests for PomodoroSession phase transitions and sound mapping.
 
+Run with: pytest -n auto pomodoro/  (pytest-xdist optional)
+"""
 
-class TestSoundForCompletedPhase(unittest.TestCase):
-    """Test sound selection for completed phases."""
-
-    def test_work_done_sound(self):
-        s = PomodoroSession(25, 5, 15, 4)
-        self.assertEqual(s.sound_for_completed_phase(s.WORK), "work_done")
+import pytest
+from pomodoro import PomodoroSession
 
-    def test_break_done_sound(self):
-        s = PomodoroSession(25, 5, 15, 4)
-        self.assertEqual(s.sound_for_completed_phase(s.SHORT_BREAK), "break_done")
 
-    def test_long_break_done_sound(self):
-        s = PomodoroSession(25, 5, 15, 4)
-        self.assertEqual(s.sound_for_completed_phase(s.LONG_BREAK), "break_done")
+@pytest.fixture
+def session():
+    return PomodoroSession(25, 5, 15, 4)
 
-    def test_all_done_on_final_work_session(self):
-        s = PomodoroSession(25, 5, 15, 1)
-        # Before advance -- should still detect final session
-        self.assertEqual(s.sound_for_completed_phase(s.WORK), "all_done")
 
-    def test_all_done_after_advance(self):
-        s = PomodoroSession(25, 5, 15, 1)
+def advance(s, times):
+    for _ in range(times):
+        s.advance()
+    return s
+
+
+# ── Advance: WORK -> BREAK -> WORK state machine ─────────────────────
+
+def test_starts_in_work_phase(session):
+    assert session.phase == session.WORK
+    assert session.current_session == 1
+    assert not session.is_complete()
+
+
+@pytest.mark.parametrize(
+    "steps,phase,current_session",
+    [
+        (1, PomodoroSession.SHORT_BREAK, 1),  # session 1 work -> short break
+        (2, PomodoroSession.WORK, 2),  # short break -> session 2 work
+    ],
+)
+def test_work_break_cycle(session, steps, phase, current_session):
+    advance(session, steps)
+    assert session.phase == phase
+    assert session.current_session == current_session
+
+
+def test_long_break_after_4th_session():
+    s = PomodoroSession(25, 5, 15, 8)
+    # 3 work+break cycles, then advance from session 4 work
+    advance(s, 7)
+    assert s.phase == s.LONG_BREAK
+
+
+@pytest.mark.parametrize("total_sessions", [1, 2])
+def test_final_session_sets_done(total_sessions):
+    s = PomodoroSession(25, 5, 15, total_sessions)
+    advance(s, 2 * (total_sessions - 1))  # reach the final work session
+    assert s.advance() is False
+    assert s.is_complete()
+
+
+def test_no_trailing_break():
+    """Final work session ends the cycle -- no break after it."""
+    s = PomodoroSession(25, 5, 15, 1)
+    s.advance()
+    assert s.is_complete()
+    # Phase should still be WORK (advance doesn't change it on completion)
+    assert s.phase == s.WORK
+
+
+# ── Phase durations ──────────────────────────────────────────────────
+
+@pytest.mark.parametrize(
+    "steps,phase,expected_secs",
+    [
+        (0, PomodoroSession.WORK, 25 * 60),
+        (1, PomodoroSession.SHORT_BREAK, 5 * 60),
+        (7, PomodoroSession.LONG_BREAK, 15 * 60),
+    ],
+)
+def test_duration_per_phase(steps, phase, expected_secs):
+    s = advance(PomodoroSession(25, 5, 15, 8), steps)
+    assert s.phase == phase
+    assert s.current_duration() == expected_secs
+
+
+# ── Sound for completed phase ────────────────────────────────────────
+
+@pytest.mark.parametrize(
+    "phase,expected",
+    [
+        (PomodoroSession.WORK, "work_done"),
+        (PomodoroSession.SHORT_BREAK, "break_done"),
+        (PomodoroSession.LONG_BREAK, "break_done"),
+    ],
+)
+def test_sound_for_completed_phase(session, phase, expected):
+    assert session.sound_for_completed_phase(phase) == expected
+
+
+@pytest.mark.parametrize("advance_first", [False, True])
+def test_all_done_on_final_work_session(advance_first):
+    s = PomodoroSession(25, 5, 15, 1)
+    if advance_first:
         s.advance()  # sets _done
-        self.assertEqual(s.sound_for_completed_phase(s.WORK), "all_done")
-
-    def test_not_all_done_on_non_final_session(self):
-        s = PomodoroSession(25, 5, 15, 4)
-        self.assertEqual(s.sound_for_completed_phase(s.WORK), "work_done")
-
-    def test_order_independence(self):
-        """sound_for_completed_phase works before or after advance()."""
-        # Before advance
-        s1 = PomodoroSession(25, 5, 15, 2)
-        s1.advance()  # work -> break
-        s1.advance()  # break -> session 2 work
-        sound_before = s1.sound_for_completed_phase(s1.WORK)
-
-        # After advance
-        s2 = PomodoroSession(25, 5, 15, 2)
-        s2.advance()
-        s2.advance()
-        s2.advance()  # session 2 work -> done
-        sound_after = s2.sound_for_completed_phase(s2.WORK)
+    assert s.sound_for_completed_phase(s.WORK) == "all_done"
 
-        self.assertEqual(sound_before, "all_done")
-        self.assertEqual(sound_after, "all_done")
 
+def test_order_independence():
+    """sound_for_completed_phase works before or after advance()."""
+    # Before advance: break -> session 2 work
+    s1 = advance(PomodoroSession(25, 5, 15, 2), 2)
+    # After advance: session 2 work -> done
+    s2 = advance(PomodoroSession(25, 5, 15, 2), 3)
 
-if __name__ == "__main__":
-    unittest.main()
+    assert s1.sound_for_completed_phase(s1.WORK) == "all_done"
+    assert s2.sound_for_completed_phase(s2.WORK) == "all_done"
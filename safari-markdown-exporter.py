@@ -5,25 +5,31 @@ Extracts main content from HTML/PDF and saves as markdown with frontmatter.
 Supports image downloading for web pages and PDF archival.
 """
 
+import functools
+import hashlib
+import os
 import sys
 import re
 import shutil
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 from urllib.parse import urlparse, urljoin, unquote
-from urllib.request import urlopen, Request
-from urllib.error import URLError
 
+# trafilatura and pymupdf are imported lazily by the HTML and PDF paths,
+# so each run only pays the import cost of the extractor it uses
 try:
-    from trafilatura import extract
+    from lxml import etree, html as lxml_html  # installed with trafilatura
+    import urllib3  # installed with trafilatura
 except ImportError:
     print("ERROR: trafilatura not installed. Run: pip install trafilatura", file=sys.stderr)
     sys.exit(1)
 
 try:
-    import fitz  # pymupdf
+    import re2 as _re_engine  # google-re2: linear-time matching for the markdown scan
 except ImportError:
-    fitz = None  # PDF support optional
+    _re_engine = re
 
 try:
     from html.parser import HTMLParser
@@ -34,11 +40,46 @@ except ImportError:
 # Base path for saving markdown files
 OBSIDIAN_BASE = Path.home() / "Library/Mobile Documents/iCloud~md~obsidian/Documents/Varun/Saved Pages"
 
+# The AppleScript saves outerHTML as UTF-8 whatever the page's <meta charset>
+# says, so parse the raw bytes as UTF-8 rather than decoding them in Python
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+# Image downloads are I/O-bound, so a thread pool overlaps the network waits
+_POOL = ThreadPoolExecutor(max_workers=int(os.environ.get("EXPORTER_DL_WORKERS", "8")))
+
+# Images larger than this (per Content-Length) are skipped, e.g. full-page hero banners
+_MAX_IMG_BYTES = int(os.environ.get("EXPORTER_MAX_IMG_BYTES", str(10 * 1024 * 1024)))
+
+# Keep-alive connection pool shared by the download threads, so images from
+# the same host reuse one TCP/TLS connection instead of reconnecting each time
+_HTTP = urllib3.PoolManager(
+    maxsize=16,
+    headers={'User-Agent': 'Mozilla/5.0 Safari/537.36'},
+    timeout=10.0,
+)
+
+# Pages resolve many image URLs against the same base; memoize the parsing
+_cached_urljoin = functools.lru_cache(maxsize=4096)(urljoin)
+_cached_urlparse = functools.lru_cache(maxsize=4096)(urlparse)
+
+# Non-content images: tracking pixels, icons, data URIs
+_SKIP_IMG_RE = re.compile(r'1x1|pixel|track|beacon|\.svg|^data:', re.IGNORECASE)
+
+# Markdown images: ![alt](url). Scanned over the full article, so use re2 if present
+_MD_IMG_RE = _re_engine.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+
+# Figure label in a caption, e.g. "Figure 2-1"
+_FIG_LABEL_RE = re.compile(r'(Figure\s+[\d\-\.]+)', re.IGNORECASE)
+
+# Filename sanitizing: invalid characters, then runs of dashes/whitespace
+_SANITIZE_RE = re.compile(r'[/:*?"<>|\\]')
+_WHITESPACE_RE = re.compile(r'[-\s]+')
+
 
 def sanitize_filename(title: str, max_length: int = 100) -> str:
     """Remove/replace characters invalid for filenames."""
-    cleaned = re.sub(r'[/:*?"<>|\\]', '-', title)
-    cleaned = re.sub(r'[-\s]+', ' ', cleaned).strip()
+    cleaned = _SANITIZE_RE.sub('-', title)
+    cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
     if len(cleaned) > max_length:
         cleaned = cleaned[:max_length].rsplit(' ', 1)[0]
     return cleaned.strip(' -')
@@ -61,71 +102,71 @@ def get_next_counter(folder: Path) -> int:
             return int(counter_file.read_text().strip()) + 1
     except (ValueError, IOError):
         pass
-    existing = list(folder.glob("*.md"))
-    return len(existing) + 1
+    # Fall back to counting saved pages; scandir avoids building a Path per entry
+    count = 0
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.name.endswith(".md") and entry.is_file(follow_symlinks=False):
+                count += 1
+    return count + 1
+
+
+def write_utf8(path: Path, text: str):
+    """Encode text once and write it with a single binary write (no TextIOWrapper)."""
+    data = text.encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
 
 
 def save_counter(folder: Path, value: int):
     """Save counter value."""
     counter_file = folder / ".counter"
-    counter_file.write_text(str(value))
+    write_utf8(counter_file, str(value))
+
+
+def _parse_html(html_bytes: bytes):
+    """Parse HTML bytes into an lxml document tree, or None if it can't be parsed."""
+    try:
+        return lxml_html.document_fromstring(html_bytes, parser=_HTML_PARSER)
+    except (etree.ParserError, ValueError):
+        return None
 
 
-def extract_figures_from_html(html_content: str, base_url: str) -> list[dict]:
-    """Extract figures with their labels, images, and captions from HTML.
+def extract_figures_from_html(tree, base_url: str) -> list[dict]:
+    """Extract figures with their labels, images, and captions from a parsed HTML tree.
 
     Returns list of dicts with keys: label, alt, src, caption
     """
     figures = []
 
-    # Pattern to find <figure> elements with their content
-    figure_pattern = re.compile(
-        r'<figure[^>]*>(.*?)</figure>',
-        re.IGNORECASE | re.DOTALL
-    )
-
-    # Patterns for content within figures
-    img_pattern = re.compile(r'<img[^>]*\ssrc=["\']([^"\']+)["\'][^>]*>', re.IGNORECASE)
-    alt_pattern = re.compile(r'\salt=["\']([^"\']*)["\']', re.IGNORECASE)
-    caption_pattern = re.compile(r'<figcaption[^>]*>(.*?)</figcaption>', re.IGNORECASE | re.DOTALL)
-    label_pattern = re.compile(r'(Figure\s+[\d\-\.]+)', re.IGNORECASE)
-
-    for figure_match in figure_pattern.finditer(html_content):
-        figure_content = figure_match.group(1)
-
+    for figure in tree.iter('figure'):
         # Find image
-        img_match = img_pattern.search(figure_content)
-        if not img_match:
+        imgs = figure.xpath(".//img[@src!='']")
+        if not imgs:
             continue
 
-        src = img_match.group(0)
-        src_url_match = re.search(r'src=["\']([^"\']+)["\']', src)
-        if not src_url_match:
-            continue
+        img = imgs[0]
 
-        src_url = src_url_match.group(1)
+        src_url = img.get('src')
 
         # Skip non-content images
-        if any(skip in src_url.lower() for skip in ['1x1', 'pixel', 'track', 'beacon', '.svg', 'data:']):
+        if _SKIP_IMG_RE.search(src_url):
             continue
 
         # Resolve relative URLs
         if not src_url.startswith(('http://', 'https://')):
-            src_url = urljoin(base_url, src_url)
+            src_url = _cached_urljoin(base_url, src_url)
 
-        # Get alt text
-        alt_match = alt_pattern.search(src)
-        alt_text = alt_match.group(1) if alt_match else ""
+        alt_text = img.get('alt', '')
 
         # Get caption
-        caption_match = caption_pattern.search(figure_content)
+        caption_el = figure.find('.//figcaption')
         caption = ""
         label = ""
-        if caption_match:
-            # Strip HTML tags from caption
-            caption = re.sub(r'<[^>]+>', '', caption_match.group(1)).strip()
+        if caption_el is not None:
+            caption = caption_el.text_content().strip()
             # Extract figure label (e.g., "Figure 2-1"), strip trailing punctuation
-            label_match = label_pattern.search(caption)
+            label_match = _FIG_LABEL_RE.search(caption)
             if label_match:
                 label = label_match.group(1).rstrip('.')
 
@@ -139,44 +180,60 @@ def extract_figures_from_html(html_content: str, base_url: str) -> list[dict]:
     return figures
 
 
-def extract_images_from_html(html_content: str, base_url: str) -> list[tuple[str, str]]:
-    """Extract standalone images (not in figures) from HTML.
+def extract_images_from_html(tree, base_url: str) -> list[tuple[str, str]]:
+    """Extract standalone images (not in figures) from a parsed HTML tree.
 
     Returns list of (alt_text, url) tuples.
     """
     images = []
 
-    # First, remove all figure elements to avoid duplicates
-    html_without_figures = re.sub(r'<figure[^>]*>.*?</figure>', '', html_content, flags=re.IGNORECASE | re.DOTALL)
-
-    # Pattern to find img tags with src attribute
-    img_pattern = re.compile(
-        r'<img[^>]*\ssrc=["\']([^"\']+)["\'][^>]*>',
-        re.IGNORECASE | re.DOTALL
-    )
-    alt_pattern = re.compile(r'\salt=["\']([^"\']*)["\']', re.IGNORECASE)
-
-    for match in img_pattern.finditer(html_without_figures):
-        img_tag = match.group(0)
-        src = match.group(1)
+    # Images inside <figure> are handled by extract_figures_from_html
+    for img in tree.xpath("//img[@src!=''][not(ancestor::figure)]"):
+        src = img.get('src')
 
         # Skip tiny images (likely icons/trackers), data URIs, and SVGs
-        if any(skip in src.lower() for skip in ['1x1', 'pixel', 'track', 'beacon', '.svg', 'data:']):
+        if _SKIP_IMG_RE.search(src):
             continue
 
-        # Get alt text if present
-        alt_match = alt_pattern.search(img_tag)
-        alt_text = alt_match.group(1) if alt_match else ""
+        alt_text = img.get('alt', '')
 
         # Resolve relative URLs
         if not src.startswith(('http://', 'https://')):
-            src = urljoin(base_url, src)
+            src = _cached_urljoin(base_url, src)
 
         images.append((alt_text, src))
 
     return images
 
 
+def find_figure_references(markdown: str, labels: set[str]) -> dict[str, int]:
+    """Locate the first reference to each figure label in a single scan.
+
+    Returns {lowercased label: offset just past the end of the referencing line}.
+    A bracketed reference like "[Figure 2-1]" takes precedence over a bare
+    "Figure 2-1". References on a final line without a newline are ignored.
+    """
+    if not labels:
+        return {}
+
+    # Longest labels first so "Figure 10" isn't claimed by "Figure 1"
+    alternation = '|'.join(re.escape(label) for label in sorted(labels, key=len, reverse=True))
+    ref_pattern = re.compile(r'(\[)?(' + alternation + r')', re.IGNORECASE)
+
+    bracketed = {}
+    bare = {}
+    for match in ref_pattern.finditer(markdown):
+        line_end = markdown.find('\n', match.end())
+        if line_end == -1:
+            break
+        key = match.group(2).lower()
+        bare.setdefault(key, line_end + 1)
+        if match.group(1) and markdown.startswith(']', match.end()):
+            bracketed.setdefault(key, line_end + 1)
+
+    return {**bare, **bracketed}
+
+
 def create_frontmatter(title: str, url: str, domain: str, source_pdf: str = None) -> str:
     """Create YAML frontmatter."""
     today = date.today().isoformat()
@@ -202,25 +259,71 @@ def create_frontmatter(title: str, url: str, domain: str, source_pdf: str = None
 
 def extract_pdf_text(pdf_path: Path) -> str:
     """Extract text from PDF using pymupdf."""
-    if fitz is None:
+    try:
+        import fitz  # pymupdf; PDF support optional
+    except ImportError:
         return "*PDF extraction unavailable - pymupdf not installed.*"
 
     try:
-        doc = fitz.open(pdf_path)
-        text_parts = []
-        for page in doc:
-            text_parts.append(page.get_text())
-        doc.close()
+        # Context manager closes the document even if a page fails to extract
+        with fitz.open(pdf_path) as doc:
+            text_parts = [None] * doc.page_count
+            for i, page in enumerate(doc):
+                text_parts[i] = page.get_text("text")
         return '\n\n'.join(text_parts).strip()
     except Exception as e:
         return f"*PDF extraction failed: {e}*"
 
 
-def download_image(img_url: str, asset_folder: Path, base_url: str) -> str | None:
-    """Download an image and return the local filename, or None if failed."""
+@functools.lru_cache(maxsize=None)
+def _load_clonefile():
+    """Return libc's clonefile(2) on macOS, or None where it isn't available."""
+    if sys.platform != 'darwin':
+        return None
+    import ctypes
+    try:
+        clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        return None
+    clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+    clonefile.restype = ctypes.c_int
+    return clonefile
+
+
+def _fast_copy(src: Path, dst: Path):
+    """Copy a file, as an APFS copy-on-write clone when possible."""
+    clonefile = _load_clonefile()
+    if clonefile is not None and clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+        return
+    shutil.copy2(src, dst)
+
+
+def is_wanted_image(headers) -> bool:
+    """Check response headers before downloading: image content, not oversized.
+
+    Missing headers are given the benefit of the doubt, and generic binary
+    types are allowed since some CDNs serve images that way.
+    """
+    content_type = headers.get('Content-Type', '').lower()
+    if content_type and not content_type.startswith(('image/', 'application/octet-stream', 'binary/octet-stream')):
+        return False
+    try:
+        content_length = int(headers.get('Content-Length') or 0)
+    except ValueError:
+        content_length = 0
+    return content_length <= _MAX_IMG_BYTES
+
+
+def claim_image_filename(img_url: str, asset_folder: Path, base_url: str) -> tuple[str, str, bool] | None:
+    """Pick and reserve the local filename for an image.
+
+    Returns (absolute_url, filename, already_downloaded), or None if the URL
+    can't be downloaded. Called in document order, so when names collide the
+    first image on the page gets the plain name.
+    """
     # Resolve relative URLs
     if not img_url.startswith(('http://', 'https://', 'data:')):
-        img_url = urljoin(base_url, img_url)
+        img_url = _cached_urljoin(base_url, img_url)
 
     # Skip data URIs and other non-http
     if not img_url.startswith(('http://', 'https://')):
@@ -228,69 +331,141 @@ def download_image(img_url: str, asset_folder: Path, base_url: str) -> str | Non
 
     try:
         # Extract filename from URL
-        parsed = urlparse(img_url)
+        parsed = _cached_urlparse(img_url)
         filename = unquote(Path(parsed.path).name)
 
-        # Skip if no valid filename
-        if not filename or '.' not in filename:
-            filename = f"image_{hash(img_url) % 10000}.jpg"
+        folder_str = str(asset_folder)
 
-        # Handle duplicate filenames
-        target_path = asset_folder / filename
-        if target_path.exists():
-            stem = target_path.stem
-            suffix = target_path.suffix
+        # No usable filename: name it by a stable digest of the URL, so the
+        # same image maps to the same file and an existing copy is reused
+        if not filename or '.' not in filename:
+            digest = hashlib.blake2b(img_url.encode('utf-8'), digest_size=6).hexdigest()
+            filename = f"image_{digest}.jpg"
+            existing = os.path.join(folder_str, filename)
+            if os.path.isfile(existing) and os.path.getsize(existing) > 0:
+                return img_url, filename, True
+
+        # Handle duplicate filenames; claim the name by creating the file.
+        # The probe loop works on plain strings to avoid building a Path per
+        # candidate.
+        target = os.path.join(folder_str, filename)
+        if os.path.exists(target):
+            stem, suffix = os.path.splitext(filename)
             counter = 2
-            while target_path.exists():
-                target_path = asset_folder / f"{stem}-{counter}{suffix}"
+            while os.path.exists(target):
+                target = os.path.join(folder_str, f"{stem}-{counter}{suffix}")
                 counter += 1
-            filename = target_path.name
+            filename = os.path.basename(target)
+        open(target, 'xb').close()
+    except (IOError, ValueError):
+        return None
 
-        # Download
-        req = Request(img_url, headers={'User-Agent': 'Mozilla/5.0 Safari/537.36'})
-        with urlopen(req, timeout=10) as response:
-            target_path.write_bytes(response.read())
+    return img_url, filename, False
 
-        return filename
-    except (URLError, IOError, ValueError):
-        return None
+
+def fetch_image(img_url: str, target: str) -> bool:
+    """Download img_url into the already-claimed file at target.
+
+    On failure the claimed file is removed and False is returned.
+    """
+    try:
+        # Download, streaming the body to disk in 1 MiB chunks
+        response = _HTTP.request('GET', img_url, preload_content=False)
+        try:
+            if response.status >= 400:
+                response.drain_conn()
+                raise urllib3.exceptions.HTTPError(f"HTTP {response.status}")
+            if not is_wanted_image(response.headers):
+                # Drop the connection instead of reading an unwanted body
+                response.close()
+                raise ValueError("not an image, or too large")
+            with open(target, 'wb') as f:
+                shutil.copyfileobj(response, f, length=1024 * 1024)
+        finally:
+            response.release_conn()
+
+        return True
+    except (urllib3.exceptions.HTTPError, IOError, ValueError):
+        try:
+            os.remove(target)
+        except OSError:
+            pass
+        return False
+
+
+def _fetch_claimed(img_url: str, target: str, filename: str) -> str | None:
+    return filename if fetch_image(img_url, target) else None
+
+
+def _resolved(value) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def submit_downloads(urls, asset_folder: Path, base_url: str) -> dict[str, Future]:
+    """Start one background download per distinct URL.
+
+    Filenames are claimed here, on the calling thread and in document order,
+    so collisions resolve the same way on every run; the pool only fetches
+    bodies. Returns {url: future of filename or None}; repeated URLs share a
+    single download.
+    """
+    futures = {}
+    folder_str = str(asset_folder)
+    for img_url in urls:
+        if img_url in futures:
+            continue
+        claim = claim_image_filename(img_url, asset_folder, base_url)
+        if claim is None:
+            futures[img_url] = _resolved(None)
+            continue
+        abs_url, filename, already_downloaded = claim
+        if already_downloaded:
+            futures[img_url] = _resolved(filename)
+        else:
+            target = os.path.join(folder_str, filename)
+            futures[img_url] = _POOL.submit(_fetch_claimed, abs_url, target, filename)
+    return futures
 
 
 def process_images(markdown: str, asset_folder: Path, base_url: str, folder_name: str) -> str:
     """Download images and rewrite markdown links to local paths."""
-    # Pattern for markdown images: ![alt](url)
-    img_pattern = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
-
     # Find all images first for logging
-    all_images = img_pattern.findall(markdown)
-    print(f"DEBUG: Found {len(all_images)} image(s) in markdown", file=sys.stderr)
-    for alt, url in all_images:
+    matches = list(_MD_IMG_RE.finditer(markdown))
+    print(f"DEBUG: Found {len(matches)} image(s) in markdown", file=sys.stderr)
+    for match in matches:
+        alt, url = match.groups()
         print(f"DEBUG:   [{alt[:30]}...] -> {url[:80]}...", file=sys.stderr)
 
-    downloaded_any = False
-
-    def replace_image(match):
-        nonlocal downloaded_any
-        alt_text = match.group(1)
-        img_url = match.group(2)
+    if not matches:
+        return markdown
 
-        # Create asset folder on first successful download
-        if not asset_folder.exists():
-            asset_folder.mkdir(parents=True, exist_ok=True)
+    # Create the asset folder once, then download all images concurrently
+    asset_folder.mkdir(parents=True, exist_ok=True)
+    futures = submit_downloads((match.group(2) for match in matches), asset_folder, base_url)
 
-        local_filename = download_image(img_url, asset_folder, base_url)
+    # Splice local links back in around the original match spans
+    downloaded_any = False
+    parts = []
+    last = 0
+    for match in matches:
+        img_url = match.group(2)
+        local_filename = futures[img_url].result()
+        parts.append(markdown[last:match.start()])
 
         if local_filename:
             downloaded_any = True
             print(f"DEBUG:   Downloaded: {local_filename}", file=sys.stderr)
             # Use Obsidian wiki-link format with folder path for disambiguation
-            return f'![[{folder_name}/{local_filename}]]'
+            parts.append(f'![[{folder_name}/{local_filename}]]')
         else:
             # Keep original URL if download failed
             print(f"DEBUG:   Failed to download: {img_url[:60]}...", file=sys.stderr)
-            return match.group(0)
-
-    result = img_pattern.sub(replace_image, markdown)
+            parts.append(match.group(0))
+        last = match.end()
+    parts.append(markdown[last:])
+    result = "".join(parts)
 
     # Clean up empty asset folder if no images downloaded
     if not downloaded_any and asset_folder.exists() and not any(asset_folder.iterdir()):
@@ -299,12 +474,28 @@ def process_images(markdown: str, asset_folder: Path, base_url: str, folder_name
     return result
 
 
-def process_html(html_content: str, url: str, title: str, domain_folder: Path,
+def process_html(html_bytes: bytes, url: str, domain: str, title: str, domain_folder: Path,
                  counter: int, today: str, safe_title: str) -> str:
     """Process HTML content: extract markdown, download images."""
+    try:
+        from trafilatura import extract
+    except ImportError:
+        print("ERROR: trafilatura not installed. Run: pip install trafilatura", file=sys.stderr)
+        sys.exit(1)
+
+    # Parse once and share the tree between trafilatura and the image scan.
+    # Figures/images are collected first so trafilatura's cleaning can't
+    # prune them from the tree.
+    tree = _parse_html(html_bytes)
+    if tree is not None:
+        figures = extract_figures_from_html(tree, url)
+        standalone_images = extract_images_from_html(tree, url)
+    else:
+        figures, standalone_images = [], []
+
     # Extract main content as markdown
     markdown_content = extract(
-        html_content,
+        tree if tree is not None else html_bytes,
         output_format='markdown',
         include_links=True,
         include_images=True,
@@ -318,57 +509,61 @@ def process_html(html_content: str, url: str, title: str, domain_folder: Path,
     folder_name = f"{counter:03d} - {today} - {safe_title}"
     asset_folder = domain_folder / folder_name
 
-    # Check if trafilatura included any images
-    img_pattern = re.compile(r'!\[[^\]]*\]\([^)]+\)')
-    trafilatura_images = img_pattern.findall(markdown_content)
-
-    if trafilatura_images:
+    # Check if trafilatura included any images (process_images does the full scan)
+    if _MD_IMG_RE.search(markdown_content):
         # Process images that trafilatura found
         markdown_content = process_images(markdown_content, asset_folder, url, folder_name)
     else:
-        # trafilatura didn't include images - extract from HTML and insert inline
-        figures = extract_figures_from_html(html_content, url)
-        standalone_images = extract_images_from_html(html_content, url)
-
+        # trafilatura didn't include images - use the ones found in the HTML and insert inline
         print(f"DEBUG: trafilatura found 0 images, extracting {len(figures)} figures + {len(standalone_images)} standalone from HTML", file=sys.stderr)
 
         if figures or standalone_images:
             asset_folder.mkdir(parents=True, exist_ok=True)
 
+        # Start all downloads up front; results are consumed in document order
+        figure_srcs = [fig['src'] for fig in figures]
+        standalone_srcs = [img_url for _alt_text, img_url in standalone_images]
+        futures = submit_downloads(figure_srcs + standalone_srcs, asset_folder, url)
+
         # Process figures - insert inline after their references
-        unmatched_figures = []
+        downloaded_figures = []
         for fig in figures:
-            local_filename = download_image(fig['src'], asset_folder, url)
-            if not local_filename:
-                continue
+            local_filename = futures[fig['src']].result()
+            if local_filename:
+                print(f"DEBUG:   Downloaded figure: {local_filename} ({fig['label']})", file=sys.stderr)
+                downloaded_figures.append((fig, local_filename))
 
-            # Use Obsidian wiki-link format with folder path for disambiguation
-            img_md = f"\n\n![[{folder_name}/{local_filename}]]\n*{fig['caption']}*\n"
-            print(f"DEBUG:   Downloaded figure: {local_filename} ({fig['label']})", file=sys.stderr)
-
-            # Try to insert after figure reference in markdown
-            inserted = False
-            if fig['label']:
-                # Look for references like "Figure 2-1" or "[Figure 2-1]"
-                # Insert image on the line after the reference
-                ref_patterns = [
-                    re.compile(r'(\[' + re.escape(fig['label']) + r'\][^\n]*\n)', re.IGNORECASE),
-                    re.compile(r'(' + re.escape(fig['label']) + r'[^\n]*\n)', re.IGNORECASE),
-                ]
-                for ref_pattern in ref_patterns:
-                    if ref_pattern.search(markdown_content):
-                        # Insert after first match only
-                        markdown_content = ref_pattern.sub(r'\1' + img_md, markdown_content, count=1)
-                        inserted = True
-                        break
-
-            if not inserted:
-                unmatched_figures.append((local_filename, fig['caption']))
+        labels = {fig['label'] for fig, _ in downloaded_figures if fig['label']}
+        ref_ends = find_figure_references(markdown_content, labels)
 
-        # Process standalone images - append at end
+        inserts = defaultdict(list)
+        unmatched_figures = []
+        for fig, local_filename in downloaded_figures:
+            ref_end = ref_ends.get(fig['label'].lower()) if fig['label'] else None
+            if ref_end is None:
+                unmatched_figures.append((local_filename, fig['caption']))
+            else:
+                # Use Obsidian wiki-link format with folder path for disambiguation
+                inserts[ref_end].append(f"\n\n![[{folder_name}/{local_filename}]]\n*{fig['caption']}*\n")
+
+        if inserts:
+            parts = []
+            last = 0
+            for pos in sorted(inserts):
+                parts.append(markdown_content[last:pos])
+                parts.extend(inserts[pos])
+                last = pos
+            parts.append(markdown_content[last:])
+            markdown_content = "".join(parts)
+
+        # Process standalone images - append at end, once per URL and only
+        # if the same image isn't already shown as a figure
         unmatched_images = []
-        for alt_text, img_url in standalone_images:
-            local_filename = download_image(img_url, asset_folder, url)
+        shown_as_figure = set(figure_srcs)
+        for img_url in dict.fromkeys(standalone_srcs):
+            if img_url in shown_as_figure:
+                continue
+            local_filename = futures[img_url].result()
             if local_filename:
                 unmatched_images.append(local_filename)
                 print(f"DEBUG:   Downloaded standalone: {local_filename}", file=sys.stderr)
@@ -383,19 +578,18 @@ def process_html(html_content: str, url: str, title: str, domain_folder: Path,
 
     # Build filename
     filename = f"{folder_name}.md"
-    domain = get_domain(url)
 
     # Build full content
     full_content = create_frontmatter(title, url, domain) + markdown_content
 
     # Save file
     output_path = domain_folder / filename
-    output_path.write_text(full_content, encoding='utf-8')
+    write_utf8(output_path, full_content)
 
     return filename
 
 
-def process_pdf(pdf_path: Path, url: str, title: str, domain_folder: Path,
+def process_pdf(pdf_path: Path, url: str, domain: str, title: str, domain_folder: Path,
                 counter: int, today: str, safe_title: str) -> str:
     """Process PDF: extract text, archive original PDF."""
     # Extract text
@@ -408,11 +602,10 @@ def process_pdf(pdf_path: Path, url: str, title: str, domain_folder: Path,
 
     # Copy PDF to asset folder
     pdf_dest = asset_folder / "source.pdf"
-    shutil.copy2(pdf_path, pdf_dest)
+    _fast_copy(pdf_path, pdf_dest)
 
     # Build filename
     filename = f"{folder_name}.md"
-    domain = get_domain(url)
 
     # Relative path for frontmatter link
     source_pdf_path = f"{folder_name}/source.pdf"
@@ -422,7 +615,7 @@ def process_pdf(pdf_path: Path, url: str, title: str, domain_folder: Path,
 
     # Save file
     output_path = domain_folder / filename
-    output_path.write_text(full_content, encoding='utf-8')
+    write_utf8(output_path, full_content)
 
     return filename
 
@@ -448,15 +641,15 @@ def main():
     safe_title = sanitize_filename(title)
 
     if is_pdf:
-        filename = process_pdf(input_file, url, title, domain_folder, counter, today, safe_title)
+        filename = process_pdf(input_file, url, domain, title, domain_folder, counter, today, safe_title)
     else:
         # Read HTML content
         try:
-            html_content = input_file.read_text(encoding='utf-8')
+            html_bytes = input_file.read_bytes()
         except IOError as e:
             print(f"ERROR: Cannot read input file: {e}", file=sys.stderr)
             sys.exit(1)
-        filename = process_html(html_content, url, title, domain_folder, counter, today, safe_title)
+        filename = process_html(html_bytes, url, domain, title, domain_folder, counter, today, safe_title)
 
     # Update counter
     save_counter(domain_folder, counter)
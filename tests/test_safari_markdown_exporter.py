@@ -0,0 +1,51 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+# The script's filename has hyphens, so load it by path.
+_SCRIPT = Path(__file__).resolve().parent.parent / "safari-markdown-exporter.py"
+_spec = importlib.util.spec_from_file_location("safari_markdown_exporter", _SCRIPT)
+exporter = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(exporter)
+
+
+class TestFindFigureReferences(unittest.TestCase):
+    def test_no_labels(self):
+        self.assertEqual(exporter.find_figure_references("Figure 1\n", set()), {})
+
+    def test_offset_is_past_end_of_referencing_line(self):
+        md = "Intro.\nAs Figure 1 shows.\nMore.\n"
+        self.assertEqual(
+            exporter.find_figure_references(md, {"Figure 1"}),
+            {"figure 1": md.index("More.")},
+        )
+
+    def test_longest_label_wins(self):
+        md = "See Figure 10 here.\nThen Figure 1.\nEnd\n"
+        refs = exporter.find_figure_references(md, {"Figure 1", "Figure 10"})
+        self.assertEqual(refs["figure 10"], md.index("Then"))
+        self.assertEqual(refs["figure 1"], md.index("End"))
+
+    def test_bracketed_reference_wins_over_earlier_bare_one(self):
+        md = "figure 2 in passing.\nSee [Figure 2] here.\nEnd\n"
+        refs = exporter.find_figure_references(md, {"Figure 2"})
+        self.assertEqual(refs, {"figure 2": md.index("End")})
+
+    def test_first_bare_reference_used_without_brackets(self):
+        md = "Figure 2 first.\nFigure 2 again.\n"
+        refs = exporter.find_figure_references(md, {"Figure 2"})
+        self.assertEqual(refs, {"figure 2": md.index("Figure 2 again")})
+
+    def test_reference_on_final_line_without_newline_is_ignored(self):
+        md = "Intro.\nlast line Figure 3"
+        self.assertEqual(exporter.find_figure_references(md, {"Figure 3"}), {})
+
+    def test_references_on_one_line_share_an_offset(self):
+        md = "Compare Figure 1 and Figure 2.\nEnd\n"
+        refs = exporter.find_figure_references(md, {"Figure 1", "Figure 2"})
+        self.assertEqual(refs, {"figure 1": md.index("End"), "figure 2": md.index("End")})
+
+
+if __name__ == "__main__":
+    unittest.main()
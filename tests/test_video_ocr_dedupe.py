@@ -1,6 +1,9 @@
+import os
 import sys
+import tempfile
 import types
 import unittest
+from unittest import mock
 
 
 # Provide lightweight stubs so video_ocr can import in non-macOS test envs.
@@ -43,5 +46,58 @@ class TestDedupeLogic(unittest.TestCase):
         self.assertTrue(video_ocr.should_keep(0b0000, 0b0001, max_diff_ratio=0.24, hash_bits=4))
 
 
+class TestSelectExpr(unittest.TestCase):
+    def test_single_frame(self):
+        # select's n is 0-based; frame numbers are 1-based
+        self.assertEqual(video_ocr._select_expr([4]), "eq(n,3)")
+
+    def test_run_collapses_to_between(self):
+        self.assertEqual(video_ocr._select_expr([1, 2, 3]), "between(n,0,2)")
+
+    def test_mixed_singles_and_runs(self):
+        self.assertEqual(
+            video_ocr._select_expr([1, 2, 3, 5, 9, 10]),
+            "between(n,0,2)+eq(n,4)+between(n,8,9)",
+        )
+
+
+class TestExtractSelectedFrames(unittest.TestCase):
+    def _fake_ffmpeg(self, written):
+        # Mimic ffmpeg's image2 muxer: selected frames numbered 1..K
+        def run(cmd, check):
+            pattern = cmd[cmd.index("-q:v") + 2]
+            for k in range(1, written + 1):
+                with open(pattern % k, "w") as f:
+                    f.write(str(k))
+        return run
+
+    def test_renames_to_original_frame_numbers(self):
+        frame_nums = [2, 3, 4, 5, 9, 40]
+        with tempfile.TemporaryDirectory() as d, \
+                mock.patch.object(video_ocr.subprocess, "run", self._fake_ffmpeg(len(frame_nums))):
+            frames = video_ocr.extract_frames("v.mp4", d, 2.0, frame_nums)
+            self.assertEqual([num for num, _t, _p in frames], frame_nums)
+            self.assertEqual([t for _n, t, _p in frames], [(n - 1) / 2.0 for n in frame_nums])
+            self.assertEqual(sorted(os.listdir(d)), [f"{n:05d}.jpg" for n in frame_nums])
+            # The k-th frame ffmpeg wrote ends up named after frame_nums[k - 1]
+            contents = []
+            for _n, _t, path in frames:
+                with open(path) as f:
+                    contents.append(f.read())
+            self.assertEqual(contents, [str(k) for k in range(1, len(frame_nums) + 1)])
+
+    def test_frame_count_mismatch_raises(self):
+        with tempfile.TemporaryDirectory() as d, \
+                mock.patch.object(video_ocr.subprocess, "run", self._fake_ffmpeg(2)):
+            with self.assertRaises(RuntimeError):
+                video_ocr.extract_frames("v.mp4", d, 2.0, [2, 3, 7])
+
+    def test_no_kept_frames_skips_ffmpeg(self):
+        with tempfile.TemporaryDirectory() as d, \
+                mock.patch.object(video_ocr.subprocess, "run") as run:
+            self.assertEqual(video_ocr.extract_frames("v.mp4", d, 2.0, []), [])
+            run.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -18,6 +18,9 @@ DAY_FIXES = {
 
 DAY_ORDER = {'Mon': 0, 'Tue': 1, 'Wed': 2, 'Thu': 3, 'Fri': 4, 'Sat': 5, 'Sun': 6}
 
+# Canonical day for every known spelling, valid names included
+CANON = {**{day: day for day in DAY_ORDER}, **DAY_FIXES}
+
 # Patterns
 WEEK_HEADER_PATTERN = re.compile(
     r'(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s+(\d{1,2})\s*-\s*'
@@ -34,87 +37,87 @@ WORKOUT_PATTERN = re.compile(
     r'(.*)?',  # Optional suffix like "- Rolling"
     re.IGNORECASE
 )
+DISTANCE_PATTERN = re.compile(r'([\d.]+)\s*mi')
 
 
 def normalize_day(day_str):
     """Normalize day name, handling OCR errors."""
     if not day_str:
         return None
-    day = day_str.strip().capitalize()
-    if len(day) >= 3:
-        day = day[:3]
-    return DAY_FIXES.get(day, day) if day not in DAY_ORDER else day
+    day = day_str.strip().capitalize()[:3]
+    return CANON.get(day, day)
 
 
 def parse_ocr_file(filepath):
     """Parse the OCR markdown file and extract weeks and workouts."""
-    content = Path(filepath).read_text()
-
     weeks = {}  # {week_num: {'dates': str, 'workouts': {day: workout_text}}}
     current_week = None
     current_dates = None
 
-    lines = content.split('\n')
-
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-
-        # Check for week date header
-        date_match = WEEK_HEADER_PATTERN.search(line)
-        if date_match:
-            start_month = date_match.group(1).upper()
-            start_day = date_match.group(2)
-            end_month = (date_match.group(3) or start_month).upper()
-            end_day = date_match.group(4)
-            current_dates = f"{start_month} {start_day} - {end_month} {end_day}"
-
-        # Check for week number
-        week_match = WEEK_NUM_PATTERN.search(line)
-        if week_match:
-            current_week = int(week_match.group(1))
-            if current_week not in weeks:
-                weeks[current_week] = {'dates': current_dates, 'workouts': {}}
-            elif current_dates and not weeks[current_week]['dates']:
-                weeks[current_week]['dates'] = current_dates
-
-        # Check for workout
-        workout_match = WORKOUT_PATTERN.search(line)
-        if workout_match and current_week:
-            day_raw = workout_match.group(1)
-            workout_type = workout_match.group(2).strip()
-            distance = workout_match.group(3)
-            suffix = (workout_match.group(4) or '').strip()
-
-            # Normalize workout type
-            workout_type = workout_type.title().replace('  ', ' ')
-            if workout_type == 'Hills':
-                workout_type = 'Hills'
-
-            # Build workout string
-            workout_str = f"{workout_type} - {distance}mi"
-            if suffix and suffix.startswith('-'):
-                workout_str += f" {suffix}"
-            elif suffix:
-                workout_str += f" - {suffix}"
-
-            # Clean up the workout string
-            workout_str = re.sub(r'\s+', ' ', workout_str).strip()
-            workout_str = re.sub(r'-\s*$', '', workout_str).strip()
-
-            day = normalize_day(day_raw)
-            if day and day in DAY_ORDER:
-                # Use (week, day) as key - later occurrences overwrite
-                weeks[current_week]['workouts'][day] = workout_str
-            else:
-                # No day specified - use a unique key
-                unknown_key = f"Unknown_{len(weeks[current_week]['workouts'])}"
-                # Only add if we don't already have this workout
-                existing = list(weeks[current_week]['workouts'].values())
-                if workout_str not in existing:
-                    weeks[current_week]['workouts'][unknown_key] = workout_str
-
-        i += 1
+    # Stream lines rather than holding the file and its split copy in memory
+    with open(filepath) as f:
+        for raw_line in f:
+            line = raw_line.strip()
+
+            # Most OCR lines match none of the patterns; a substring test each
+            # pattern requires (a date range's dash, "week", the "m" of "mi")
+            # rules a line out far cheaper than running the regex on it.
+            lowered = line.lower()
+
+            # Check for week date header
+            date_match = WEEK_HEADER_PATTERN.search(line) if '-' in line else None
+            if date_match:
+                start_month = date_match.group(1).upper()
+                start_day = date_match.group(2)
+                end_month = (date_match.group(3) or start_month).upper()
+                end_day = date_match.group(4)
+                current_dates = f"{start_month} {start_day} - {end_month} {end_day}"
+
+            # Check for week number
+            week_match = WEEK_NUM_PATTERN.search(line) if 'week' in lowered else None
+            if week_match:
+                current_week = int(week_match.group(1))
+                if current_week not in weeks:
+                    weeks[current_week] = {'dates': current_dates, 'workouts': {}}
+                elif current_dates and not weeks[current_week]['dates']:
+                    weeks[current_week]['dates'] = current_dates
+
+            # Check for workout
+            workout_match = WORKOUT_PATTERN.search(line) if 'm' in lowered else None
+            if workout_match and current_week:
+                day_raw = workout_match.group(1)
+                workout_type = workout_match.group(2).strip()
+                distance = workout_match.group(3)
+                suffix = (workout_match.group(4) or '').strip()
+
+                # Normalize workout type
+                workout_type = workout_type.title().replace('  ', ' ')
+                if workout_type == 'Hills':
+                    workout_type = 'Hills'
+
+                # Build workout string
+                workout_str = f"{workout_type} - {distance}mi"
+                if suffix and suffix.startswith('-'):
+                    workout_str += f" {suffix}"
+                elif suffix:
+                    workout_str += f" - {suffix}"
+
+                # Clean up the workout string: collapse whitespace, drop a trailing dash
+                workout_str = ' '.join(workout_str.split())
+                if workout_str.endswith('-'):
+                    workout_str = workout_str[:-1].rstrip()
+
+                day = normalize_day(day_raw)
+                if day and day in DAY_ORDER:
+                    # Use (week, day) as key - later occurrences overwrite
+                    weeks[current_week]['workouts'][day] = workout_str
+                else:
+                    # No day specified - use a unique key
+                    unknown_key = f"Unknown_{len(weeks[current_week]['workouts'])}"
+                    # Only add if we don't already have this workout
+                    existing = list(weeks[current_week]['workouts'].values())
+                    if workout_str not in existing:
+                        weeks[current_week]['workouts'][unknown_key] = workout_str
 
     return weeks
 
@@ -135,14 +138,14 @@ def deduplicate_workouts(workouts):
     known_distances = set()
     for day, workout in day_workouts:
         # Extract distance pattern like "6mi" or "3.25mi"
-        dist_match = re.search(r'([\d.]+)\s*mi', workout)
+        dist_match = DISTANCE_PATTERN.search(workout)
         if dist_match:
             known_distances.add(dist_match.group(1))
 
     # Filter unknown workouts - remove if distance already exists in known workouts
     filtered_unknown = []
     for workout in unknown_workouts:
-        dist_match = re.search(r'([\d.]+)\s*mi', workout)
+        dist_match = DISTANCE_PATTERN.search(workout)
         if dist_match:
             if dist_match.group(1) not in known_distances:
                 filtered_unknown.append(workout)
@@ -154,13 +157,10 @@ def deduplicate_workouts(workouts):
 
 
 def generate_markdown(weeks):
-    """Generate clean markdown from parsed weeks."""
-    lines = [
-        "# BMO Vancouver Half Marathon Training Plan",
-        "",
-        "Race: May 3, 2026",
-        "",
-    ]
+    """Generate clean markdown from parsed weeks, one line at a time (no newlines)."""
+    yield "# BMO Vancouver Half Marathon Training Plan"
+    yield ""
+    yield "Race: May 3, 2026"
 
     for week_num in sorted(weeks.keys()):
         week = weeks[week_num]
@@ -172,7 +172,9 @@ def generate_markdown(weeks):
         if not day_workouts and not unknown_workouts:
             continue
 
-        lines.append(f"## Week {week_num} ({dates})")
+        # Blank line before each week, so the file ends right after the last workout
+        yield ""
+        yield f"## Week {week_num} ({dates})"
 
         # Sort workouts by day order
         sorted_workouts = []
@@ -183,15 +185,11 @@ def generate_markdown(weeks):
                     break
 
         for day, workout in sorted_workouts:
-            lines.append(f"- {day}: {workout}")
+            yield f"- {day}: {workout}"
 
         # Add unknown-day workouts at the end
         for workout in unknown_workouts:
-            lines.append(f"- ?: {workout}")
-
-        lines.append("")
-
-    return '\n'.join(lines)
+            yield f"- ?: {workout}"
 
 
 def main():
@@ -206,8 +204,8 @@ def main():
         workout_count = len(weeks[week_num]['workouts'])
         print(f"  Week {week_num}: {workout_count} workouts")
 
-    markdown = generate_markdown(weeks)
-    output_file.write_text(markdown)
+    with output_file.open('w') as f:
+        f.writelines(line + '\n' for line in generate_markdown(weeks))
     print(f"\nWritten to {output_file}")
 
 
@@ -6,10 +6,33 @@ Optimized for M3 Pro GPU acceleration.
 
 import glob
 import os
+import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import mlx.core as mx
 import mlx_whisper
+import numpy as np
+from mlx_whisper.audio import SAMPLE_RATE
+from mlx_whisper.transcribe import ModelHolder
+
+
+def decode_audio(path: str, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode an audio file to mono float32 samples with ffmpeg.
+
+    Same output as mlx_whisper.audio.load_audio, but as a NumPy array, so it
+    can run on a worker thread without building MLX ops there.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr), "-",
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode()}") from e
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
 
 
 def transcribe_files(
@@ -39,33 +62,46 @@ def transcribe_files(
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
 
+    # Load the weights once up front. transcribe() looks the model up in the
+    # same ModelHolder cache (fp16 by default), so no file pays for the load.
+    ModelHolder.get_model(model, mx.float16)
+
     total_start = time.time()
 
-    for i, mp3_path in enumerate(mp3_files, 1):
-        filename = os.path.basename(mp3_path)
-        stem = Path(mp3_path).stem
-        output_path = os.path.join(output_dir, f"{stem}.txt")
+    # Decode the next file (ffmpeg, off the GPU) while the current one transcribes
+    with ThreadPoolExecutor(max_workers=1) as prefetch:
+        next_audio = prefetch.submit(decode_audio, mp3_files[0])
+
+        for i, mp3_path in enumerate(mp3_files, 1):
+            filename = os.path.basename(mp3_path)
+            stem = Path(mp3_path).stem
+            output_path = os.path.join(output_dir, f"{stem}.txt")
+
+            audio_future = next_audio
+            if i < len(mp3_files):
+                next_audio = prefetch.submit(decode_audio, mp3_files[i])
 
-        print(f"\n[{i}/{len(mp3_files)}] Transcribing: {filename}")
-        start = time.time()
+            print(f"\n[{i}/{len(mp3_files)}] Transcribing: {filename}")
+            start = time.time()
 
-        try:
-            # Transcribe using MLX Whisper
-            result = mlx_whisper.transcribe(
-                mp3_path,
-                path_or_hf_repo=model,
-                verbose=False,
-            )
+            try:
+                # Transcribe using MLX Whisper
+                result = mlx_whisper.transcribe(
+                    # MLX arrays are only created here, on the main thread
+                    mx.array(audio_future.result()),
+                    path_or_hf_repo=model,
+                    verbose=False,
+                )
 
-            # Save transcript
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(result["text"].strip())
+                # Save transcript
+                with open(output_path, "w", encoding="utf-8") as f:
+                    f.write(result["text"].strip())
 
-            elapsed = time.time() - start
-            print(f"    Done in {elapsed:.1f}s -> {output_path}")
+                elapsed = time.time() - start
+                print(f"    Done in {elapsed:.1f}s -> {output_path}")
 
-        except Exception as e:
-            print(f"    ERROR: {e}")
+            except Exception as e:
+                print(f"    ERROR: {e}")
 
     total_elapsed = time.time() - total_start
     print("\n" + "=" * 60)
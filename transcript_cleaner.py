@@ -8,13 +8,22 @@ import argparse
 import json
 import re
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads  # stdlib accepts bytes too
+
 
 # Pattern for Speaker Timestamp Text format
 # Matches: "Speaker Name 0:03" or "Speaker Name 12:34" or "Speaker Name 1:23:45"
+# The name is greedy: it runs to the digits and gives back one space, instead
+# of retrying the timestamp after every character. Any extra spaces it keeps
+# are removed by the strip() in parse_entries.
 ENTRY_PATTERN = re.compile(
-    r'^([A-Za-z][A-Za-z ]+?)\s+(\d{1,2}:\d{2}(?::\d{2})?)\s*$',
+    r'^([A-Za-z][A-Za-z ]+)\s+(\d{1,2}:\d{2}(?::\d{2})?)\s*$',
     re.MULTILINE
 )
 
@@ -39,12 +48,15 @@ def parse_entries(text: str) -> list[dict]:
             entries.append({
                 "speaker": speaker,
                 "timestamp": timestamp,
-                "text": content
+                "text": content,
+                "_seconds": timestamp_to_seconds(timestamp),
             })
 
     return entries
 
 
+# The same entries (and timestamps) recur in many consecutive OCR frames
+@lru_cache(maxsize=4096)
 def timestamp_to_seconds(ts: str) -> int:
     """Convert M:SS, MM:SS, or H:MM:SS to seconds for sorting."""
     parts = ts.split(":")
@@ -72,7 +84,7 @@ def deduplicate_entries(all_entries: list[dict]) -> list[dict]:
         deduped.append(best)
 
     # Sort by timestamp
-    deduped.sort(key=lambda e: timestamp_to_seconds(e["timestamp"]))
+    deduped.sort(key=lambda e: e["_seconds"])
 
     return deduped
 
@@ -97,9 +109,9 @@ def process_jsonl(input_path: str, output_path: str):
     all_entries = []
     frame_count = 0
 
-    with open(input_path, "r", encoding="utf-8") as f:
+    with open(input_path, "rb") as f:
         for line in f:
-            frame = json.loads(line)
+            frame = json_loads(line)
             frame_count += 1
             entries = parse_entries(frame["text"])
             all_entries.extend(entries)
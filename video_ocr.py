@@ -14,12 +14,21 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # only needed for --dedupe
+
 import Vision
 from Cocoa import NSURL
 
 
-def hamming_distance(a: int, b: int) -> int:
-    return bin(a ^ b).count("1")
+if hasattr(int, "bit_count"):  # Python 3.10+
+    def hamming_distance(a: int, b: int) -> int:
+        return (a ^ b).bit_count()
+else:  # pragma: no cover
+    def hamming_distance(a: int, b: int) -> int:
+        return bin(a ^ b).count("1")
 
 
 def diff_ratio(a: int, b: int, hash_bits: int) -> float:
@@ -36,44 +45,39 @@ def should_keep(prev_hash: Optional[int], curr_hash: int, max_diff_ratio: float,
     return diff_ratio(prev_hash, curr_hash, hash_bits) > max_diff_ratio
 
 
-def compute_ahash(image_path: str, hash_size: int) -> int:
-    """Compute a simple perceptual average hash (aHash) for an image."""
-    if hash_size <= 0:
-        raise ValueError("hash_size must be > 0")
-
-    try:
-        from PIL import Image  # type: ignore
-    except Exception as e:  # pragma: no cover
-        raise RuntimeError(
-            "Pillow is required for --dedupe. Install with: pip install pillow"
-        ) from e
-
-    resample = getattr(Image, "Resampling", Image).LANCZOS
-    with Image.open(image_path) as img:
-        img = img.convert("L").resize((hash_size, hash_size), resample)
-        pixels = list(img.getdata())
-
-    avg = sum(pixels) / len(pixels)
-    bits = 0
-    for p in pixels:
-        bits = (bits << 1) | (1 if p > avg else 0)
-    return bits
+def pack_ahashes(thumbs):
+    """Threshold each flattened thumbnail row at its own mean and pack the bits per row."""
+    return np.packbits(thumbs > thumbs.mean(axis=1, keepdims=True), axis=1)
 
 
 def dedupe_frames(
     frames: list[tuple[int, float, str]],
+    hashes,
     max_diff_ratio: float,
-    hash_size: int,
+    hash_bits: int,
 ) -> list[tuple[int, float, str]]:
-    """Keep frames whose visual hash differs beyond the threshold."""
-    hash_bits = hash_size * hash_size
+    """Keep frames whose visual hash differs beyond the threshold.
+
+    `hashes` is the packed matrix from pack_ahashes, one row per frame.
+    """
+    if not (0.0 <= max_diff_ratio <= 1.0):
+        raise ValueError("max_diff_ratio must be between 0 and 1")
+    if hash_bits <= 0:
+        raise ValueError("hash_bits must be > 0")
+
+    # Largest Hamming distance should_keep still calls similar. Found with the
+    # same float comparison, so the integer test in the loop agrees exactly.
+    max_similar = max(d for d in range(hash_bits + 1) if not d / hash_bits > max_diff_ratio)
+
     kept: list[tuple[int, float, str]] = []
     prev_hash: Optional[int] = None
 
-    for frame_num, time_sec, path in frames:
-        curr_hash = compute_ahash(path, hash_size)
-        if should_keep(prev_hash, curr_hash, max_diff_ratio, hash_bits):
-            kept.append((frame_num, time_sec, path))
+    # One int per row (pad bits are zero in every row, so distances are exact);
+    # XOR + bit_count then costs the same for any hash_size.
+    for frame, row in zip(frames, hashes):
+        curr_hash = int.from_bytes(row.tobytes(), "big")
+        if prev_hash is None or hamming_distance(prev_hash, curr_hash) > max_similar:
+            kept.append(frame)
             prev_hash = curr_hash
 
     return kept
@@ -93,29 +97,23 @@ def write_markdown(
     out_path = Path(output_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    lines: list[str] = []
-    lines.append("# Instructional OCR")
-    lines.append("")
-    lines.append(f"- Source video: `{video_path}`")
-    lines.append(f"- Frames: {len(results)}")
-    lines.append("")
-
-    for result in results:
-        frame_num = result["frame"]
-        time_sec = result["time_sec"]
-        lines.append(f"## Frame {frame_num:05d} @ {time_sec}s")
-        lines.append("")
-        if include_images and images_dir:
-            img_path = os.path.join(images_dir, _frame_filename(frame_num))
-            rel_path = os.path.relpath(img_path, start=out_path.parent)
-            lines.append(f"![]({rel_path})")
-            lines.append("")
-        lines.append("```text")
-        lines.append((result["text"] or "").rstrip())
-        lines.append("```")
-        lines.append("")
-
-    out_path.write_text("\n".join(lines), encoding="utf-8")
+    # Written section by section so the whole document is never held in memory
+    with out_path.open("w", encoding="utf-8") as f:
+        f.write("# Instructional OCR\n\n")
+        f.write(f"- Source video: `{video_path}`\n")
+        f.write(f"- Frames: {len(results)}\n")
+
+        for result in results:
+            frame_num = result["frame"]
+            time_sec = result["time_sec"]
+            f.write(f"\n## Frame {frame_num:05d} @ {time_sec}s\n\n")
+            if include_images and images_dir:
+                img_path = os.path.join(images_dir, _frame_filename(frame_num))
+                rel_path = os.path.relpath(img_path, start=out_path.parent)
+                f.write(f"![]({rel_path})\n\n")
+            f.write("```text\n")
+            f.write((result["text"] or "").rstrip())
+            f.write("\n```\n")
 
 
 def ocr_image(image_path: str) -> str:
@@ -149,23 +147,95 @@ def ocr_image(image_path: str) -> str:
     return "\n".join(lines)
 
 
-def extract_frames(video_path: str, output_dir: str, fps: float) -> list[tuple[int, float, str]]:
-    """Extract frames from video at specified fps. Returns list of (frame_num, time_sec, path)."""
+def extract_thumbs_raw(video_path: str, fps: float, hash_size: int):
+    """Decode the video at fps straight to hash_size x hash_size grayscale thumbnails.
+
+    Returns an (N, hash_size * hash_size) uint8 array; row i is frame i + 1 of
+    extract_frames at the same fps. Nothing is written to disk.
+    """
+    if hash_size <= 0:
+        raise ValueError("hash_size must be > 0")
+    if np is None:  # pragma: no cover
+        raise RuntimeError(
+            "NumPy is required for --dedupe. Install with: pip install numpy"
+        )
+
+    cmd = [
+        "ffmpeg", "-i", video_path,
+        "-vf", f"fps={fps},scale={hash_size}:{hash_size}:flags=area,format=gray",
+        "-f", "rawvideo", "pipe:1",
+        "-hide_banner", "-loglevel", "error"
+    ]
+    raw = subprocess.run(cmd, check=True, stdout=subprocess.PIPE).stdout
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, hash_size * hash_size)
+
+
+def _select_expr(frame_nums: list[int]) -> str:
+    """ffmpeg select expression for the given 1-based frame numbers (sorted)."""
+    # Collapse runs so long stretches of kept frames stay one term
+    terms = []
+    start = prev = frame_nums[0]
+    for num in frame_nums[1:] + [None]:
+        if num is not None and num == prev + 1:
+            prev = num
+            continue
+        # select's n counts from 0
+        if start == prev:
+            terms.append(f"eq(n,{start - 1})")
+        else:
+            terms.append(f"between(n,{start - 1},{prev - 1})")
+        if num is not None:
+            start = prev = num
+    return "+".join(terms)
+
+
+def extract_frames(
+    video_path: str,
+    output_dir: str,
+    fps: float,
+    frame_nums: Optional[list[int]] = None,
+) -> list[tuple[int, float, str]]:
+    """Extract frames from video at specified fps. Returns list of (frame_num, time_sec, path).
+
+    With frame_nums (sorted, 1-based), only those frames are written, under
+    the same names a full extraction would give them.
+    """
     os.makedirs(output_dir, exist_ok=True)
+    if frame_nums is not None and not frame_nums:
+        return []
 
     # Extract frames using ffmpeg
+    vf = f"fps={fps}"
+    if frame_nums is not None:
+        vf += f",select='{_select_expr(frame_nums)}'"
     cmd = [
         "ffmpeg", "-i", video_path,
-        "-vf", f"fps={fps}",
+        "-vf", vf,
+        *(["-fps_mode", "passthrough"] if frame_nums is not None else []),
         "-q:v", "2",  # High quality JPEG
         os.path.join(output_dir, "%05d.jpg"),
         "-y", "-hide_banner", "-loglevel", "error"
     ]
     subprocess.run(cmd, check=True)
 
+    files = sorted(Path(output_dir).glob("*.jpg"))
+    if frame_nums is not None:
+        if len(files) != len(frame_nums):
+            raise RuntimeError(
+                f"ffmpeg wrote {len(files)} frames, expected {len(frame_nums)}"
+            )
+        # ffmpeg numbers selected frames 1..K; rename to the original frame
+        # numbers, last first (frame_nums[k] >= k + 1, so nothing is clobbered)
+        renamed = []
+        for f, frame_num in reversed(list(zip(files, frame_nums))):
+            dest = f.with_name(_frame_filename(frame_num))
+            os.replace(f, dest)
+            renamed.append(dest)
+        files = renamed[::-1]
+
     # Collect frame info
     frames = []
-    for f in sorted(Path(output_dir).glob("*.jpg")):
+    for f in files:
         frame_num = int(f.stem)
         time_sec = (frame_num - 1) / fps  # ffmpeg starts at 1
         frames.append((frame_num, time_sec, str(f)))
@@ -190,17 +260,27 @@ def process_video(
     print(f"FPS: {fps}, Workers: {workers}")
 
     with tempfile.TemporaryDirectory() as temp_dir:
+        frame_nums = None
+        if dedupe:
+            # Hash thumbnails piped straight from ffmpeg, then write full-size
+            # JPEGs only for the frames that survive
+            print(f"Deduping frames (threshold={dedupe_threshold}, hash_size={hash_size})...")
+            thumbs = extract_thumbs_raw(video_path, fps, hash_size)
+            candidates = [
+                (num, (num - 1) / fps, os.path.join(temp_dir, _frame_filename(num)))
+                for num in range(1, len(thumbs) + 1)
+            ]
+            kept = dedupe_frames(
+                candidates, pack_ahashes(thumbs), dedupe_threshold, hash_size * hash_size
+            )
+            frame_nums = [num for num, _time_sec, _path in kept]
+            print(f"Kept {len(kept)} / {len(candidates)} frames after dedupe")
+
         # Extract frames
         print("Extracting frames...")
-        frames = extract_frames(video_path, temp_dir, fps)
+        frames = extract_frames(video_path, temp_dir, fps, frame_nums)
         print(f"Extracted {len(frames)} frames")
 
-        if dedupe:
-            print(f"Deduping frames (threshold={dedupe_threshold}, hash_size={hash_size})...")
-            before = len(frames)
-            frames = dedupe_frames(frames, dedupe_threshold, hash_size)
-            print(f"Kept {len(frames)} / {before} frames after dedupe")
-
         if frames_out:
             out_dir = Path(frames_out)
             out_dir.mkdir(parents=True, exist_ok=True)
@@ -210,30 +290,30 @@ def process_video(
 
         # OCR in parallel
         print("Running OCR...")
-        results = []
+        # frames is in frame order, so each result goes straight to its slot
+        # (frame numbers have gaps after dedupe; list positions do not)
+        results: list[dict] = [None] * len(frames)
 
         with ThreadPoolExecutor(max_workers=workers) as executor:
             future_to_frame = {
-                executor.submit(ocr_image, path): (num, time_sec)
-                for num, time_sec, path in frames
+                executor.submit(ocr_image, path): (idx, num, time_sec)
+                for idx, (num, time_sec, path) in enumerate(frames)
             }
 
             completed = 0
             for future in as_completed(future_to_frame):
-                frame_num, time_sec = future_to_frame[future]
+                idx, frame_num, time_sec = future_to_frame[future]
                 text = future.result()
-                results.append({
+                results[idx] = {
                     "frame": frame_num,
                     "time_sec": round(time_sec, 3),
                     "text": text
-                })
+                }
                 completed += 1
                 if completed % 10 == 0:
                     print(f"  {completed}/{len(frames)} frames processed")
 
-        # Sort by frame number and write output
-        results.sort(key=lambda x: x["frame"])
-
+        # Write output
         with open(output_path, "w", encoding="utf-8") as f:
             for result in results:
                 f.write(json.dumps(result, ensure_ascii=False) + "\n")